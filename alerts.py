@@ -0,0 +1,45 @@
+import threading
+from contextlib import contextmanager
+from tkinter import messagebox
+
+# Alerts raised inside a deferred() block on this thread, or None outside one
+_pending = threading.local()
+
+
+def _display(kind, title, message):
+    getattr(messagebox, f"show{kind}")(title, message)
+
+
+def show(kind, title, message):
+    """
+    Shows a modal alert to the user, or queues it if the current thread is
+    inside a deferred() block.
+
+    :param kind: "error", "warning" or "info" (selects the messagebox style).
+    :param title: Window title.
+    :param message: Alert text.
+    """
+    queue = getattr(_pending, "alerts", None)
+    if queue is not None:
+        queue.append((kind, title, message))
+    else:
+        _display(kind, title, message)
+
+
+@contextmanager
+def deferred():
+    """
+    Holds back alerts raised by this thread until the outermost deferred()
+    block exits. Writers wrap their locked section in it, so a modal dialog
+    never keeps the hub's write lock held while waiting for the user.
+    """
+    if getattr(_pending, "alerts", None) is not None:
+        yield
+        return
+    _pending.alerts = []
+    try:
+        yield
+    finally:
+        queued, _pending.alerts = _pending.alerts, None
+        for alert in queued:
+            _display(*alert)
@@ -13,6 +13,13 @@ class Command(ABC):
         """
         pass
 
+    def targets(self):
+        """
+        Returns the devices this command changes, so the hub only has to refresh
+        the rooms that contain them. None means unknown: everything is refreshed.
+        """
+        return None
+
 class TogglePowerCommand(Command):
     """
     A concrete command to flip the power state of any SmartDevice.
@@ -33,6 +40,9 @@ class TogglePowerCommand(Command):
             return self.device.powerOn()
         return self.device.powerOff()
 
+    def targets(self):
+        return (self.device,)
+
 class ChangeTempCommand(Command):
     """
     A specialized command for Thermostat devices.
@@ -50,4 +60,75 @@ class ChangeTempCommand(Command):
         """
         Invokes the temperature change logic on the thermostat.
         """
-        return self.thermostat.change_temp(self.temp)
\ No newline at end of file
+        return self.thermostat.change_temp(self.temp)
+
+    def targets(self):
+        return (self.thermostat,)
+
+class ArmCommand(Command):
+    """
+    Arms a SecurityDevice by powering it on through its current state.
+    """
+    def __init__(self, device):
+        """
+        :param device: The SecurityDevice (Receiver) to be armed.
+        """
+        self.device = device
+
+    def execute(self):
+        return self.device.powerOn()
+
+    def targets(self):
+        return (self.device,)
+
+
+class DisarmCommand(Command):
+    """
+    Disarms a SecurityDevice by powering it off through its current state.
+    """
+    def __init__(self, device):
+        """
+        :param device: The SecurityDevice (Receiver) to be disarmed.
+        """
+        self.device = device
+
+    def execute(self):
+        return self.device.powerOff()
+
+    def targets(self):
+        return (self.device,)
+
+
+class UnblockCommand(Command):
+    """
+    Lifts the lockdown of a SecurityLock.
+    """
+    def __init__(self, device):
+        """
+        :param device: The SecurityLock (Receiver) to be unblocked.
+        """
+        self.device = device
+
+    def execute(self):
+        return self.device.unblock()
+
+    def targets(self):
+        return (self.device,)
+
+
+class TriggerDetectionCommand(Command):
+    """
+    Simulates a motion sensor detecting movement. An armed sensor reports
+    the breach, which the hub turns into a system-wide lockdown.
+    """
+    def __init__(self, sensor):
+        """
+        :param sensor: The SecurityMotionSensor (Receiver) that detects motion.
+        """
+        self.sensor = sensor
+
+    def execute(self):
+        return self.sensor.trigger_detection()
+
+    def targets(self):
+        return (self.sensor,)
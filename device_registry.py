@@ -0,0 +1,184 @@
+import importlib
+
+# ==========================================
+# CAPABILITIES
+# ==========================================
+
+POWERABLE = "powerable"
+TEMPERATURE = "temperature"
+LOCKABLE = "lockable"
+ALARM = "alarm"
+SENSOR = "sensor"
+
+# Any of these marks a device as part of the security system (arm/disarm)
+SECURITY = frozenset({LOCKABLE, ALARM, SENSOR})
+
+
+def _load(target):
+    """Imports a "module:attribute" reference and returns the attribute."""
+    module_name, attr = target.split(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class DeviceType:
+    """
+    Describes one kind of device: how to build it, what it can do and how the
+    remote panel draws it. The constructor and renderer are given as
+    "module:attribute" strings and only imported the first time they are needed.
+    """
+    def __init__(self, name, code, target, capabilities, renderer=None, needs_breach_callback=False):
+        """
+        :param name: The type name shown to users (e.g., "Thermostat").
+        :param code: Small integer identifying the type outside the process.
+        :param target: "module:Class" reference to the device constructor.
+        :param capabilities: Iterable of capability names.
+        :param renderer: Optional "module:function" drawing the device on the remote panel,
+                         called as renderer(ui, frame, device_snapshot).
+        :param needs_breach_callback: True if the constructor takes the room's breach callback.
+        """
+        self.name = name
+        self.code = code
+        self.target = target
+        self.capabilities = frozenset(capabilities)
+        self.renderer_target = renderer
+        self.needs_breach_callback = needs_breach_callback
+        self._factory = None
+        self._renderer = None
+
+    @property
+    def factory(self):
+        """The device constructor, imported on first access."""
+        if self._factory is None:
+            self._factory = _load(self.target)
+        return self._factory
+
+    @property
+    def renderer(self):
+        """The remote panel renderer (imported on first access), or None."""
+        if self._renderer is None and self.renderer_target:
+            self._renderer = _load(self.renderer_target)
+        return self._renderer
+
+    def create(self, name, breach_callback=None):
+        """
+        Instantiates a device of this type.
+
+        :param name: The friendly name for the new device.
+        :param breach_callback: Passed to constructors that need it.
+        :return: The new device object.
+        """
+        if self.needs_breach_callback:
+            return self.factory(name, breach_callback)
+        return self.factory(name)
+
+
+class DeviceRegistry:
+    """
+    Central catalogue of device types. Registering a type is cheap (no imports),
+    so the catalogue can grow without slowing down startup.
+    """
+    MAX_CODE = 254
+
+    def __init__(self):
+        self._types = {}
+        self._by_code = {}
+        self._by_target = {}
+        self._class_cache = {}
+
+    def register(self, name, code, target, capabilities, renderer=None, needs_breach_callback=False):
+        """
+        Adds a device type to the catalogue. See DeviceType for the parameters.
+
+        The code is published to external readers (e.g. the status table), so it
+        must be chosen once per type and never reused, whatever the import order.
+
+        :return: The registered DeviceType.
+        """
+        if name in self._types:
+            raise ValueError(f"Device type already registered: {name}")
+        if not 1 <= code <= self.MAX_CODE:
+            raise ValueError(f"Device type code must be between 1 and {self.MAX_CODE}: {code}")
+        if code in self._by_code:
+            raise ValueError(f"Device type code {code} is already used by {self._by_code[code].name}")
+        if target in self._by_target:
+            raise ValueError(f"{target} is already registered as {self._by_target[target].name}")
+        dev_type = DeviceType(name, code, target, capabilities, renderer, needs_breach_callback)
+        self._types[name] = dev_type
+        self._by_code[code] = dev_type
+        self._by_target[target] = dev_type
+        self._class_cache.clear()
+        return dev_type
+
+    def get(self, name):
+        """
+        :param name: A registered type name.
+        :return: The matching DeviceType.
+        """
+        if name not in self._types:
+            raise ValueError(f"Unknown device type: {name}")
+        return self._types[name]
+
+    def get_by_code(self, code):
+        """
+        :param code: A registered type code.
+        :return: The matching DeviceType.
+        """
+        if code not in self._by_code:
+            raise ValueError(f"Unknown device type code: {code}")
+        return self._by_code[code]
+
+    def names(self):
+        """Returns the registered type names in registration order."""
+        return list(self._types)
+
+    def create(self, type_name, name, breach_callback=None):
+        """Shortcut for get(type_name).create(name, breach_callback)."""
+        return self.get(type_name).create(name, breach_callback)
+
+    def type_for_class(self, cls):
+        """
+        Finds the DeviceType registered for a class or, like isinstance, for the
+        nearest registered base class. Matching is done on the "module:Class"
+        reference, so no plugin module is imported by the lookup.
+
+        :param cls: A device class.
+        :return: The matching DeviceType, or None.
+        """
+        if cls not in self._class_cache:
+            self._class_cache[cls] = next(
+                (self._by_target[key] for key in (f"{c.__module__}:{c.__qualname__}" for c in cls.__mro__)
+                 if key in self._by_target),
+                None,
+            )
+        return self._class_cache[cls]
+
+
+def type_of(dev):
+    """
+    Returns the DeviceType of a device, based on its class, or None.
+    Works the same whether or not the device was created through the registry.
+    """
+    return registry.type_for_class(type(dev))
+
+
+def has_capability(dev, *capabilities):
+    """
+    Checks whether a device has at least one of the given capabilities.
+
+    :param dev: A device object.
+    :param capabilities: One or more capability names.
+    """
+    dev_type = type_of(dev)
+    return dev_type is not None and not dev_type.capabilities.isdisjoint(capabilities)
+
+
+registry = DeviceRegistry()
+
+registry.register("Light", 1, "devices:LightFixture", {POWERABLE},
+                  renderer="main_ui_classes:render_power_toggle")
+registry.register("Thermostat", 2, "devices:SmartThermostat", {POWERABLE, TEMPERATURE},
+                  renderer="main_ui_classes:render_thermostat")
+registry.register("Lock", 3, "security_system:SecurityLock", {LOCKABLE})
+registry.register("Motion Sensor", 4, "security_system:SecurityMotionSensor", {SENSOR},
+                  needs_breach_callback=True)
+registry.register("Alarm", 5, "security_system:SecurityAlarm", {ALARM})
@@ -1,6 +1,12 @@
-from tkinter import messagebox
+import logging
+import threading
+from contextlib import contextmanager
+import alerts
 from room import Room
-from security_system import SecurityLock, SecurityAlarm
+from snapshot import build_snapshot, RoomSnapshot, EMPTY_SNAPSHOT
+from device_registry import has_capability, LOCKABLE, ALARM
+
+logger = logging.getLogger(__name__)
 
 #Factory design pattern
 class HomeHub:
@@ -11,8 +17,19 @@ class HomeHub:
     """
 
     def __init__(self):
-        """Initialize the HomeHub with an empty list of rooms."""
-        self.rooms = []
+        """
+        Initialize the HomeHub with no rooms.
+
+        `rooms` is an immutable tuple that is replaced (copy-on-write) rather
+        than mutated, so it can be iterated safely while writers add rooms.
+        """
+        self.rooms = ()
+        self._write_lock = threading.RLock()
+        self._snapshot = EMPTY_SNAPSHOT
+        # Device id -> (Room, device), used to map command targets to the rooms
+        # to refresh and to resolve the devices that snapshot readers act on
+        self._index = {}
+        self.subscribers = []
 
     def create_room(self, name):
         """
@@ -22,10 +39,176 @@ class HomeHub:
         :return: The newly created Room instance.
         """
         # Pass self.on_security_breach as the callback so the Room can notify the Hub
-        new_room = Room(name, self.on_security_breach)
-        self.rooms.append(new_room)
+        new_room = Room(name, self.on_security_breach, self.mutate)
+        with self._writing():
+            self.rooms = self.rooms + (new_room,)
+            self.publish(rooms=(new_room,))
         return new_room
 
+    @contextmanager
+    def _writing(self):
+        """
+        Holds the write lock. Alerts raised meanwhile (e.g. sirens going off)
+        are only shown once it has been released, so other writers never wait
+        on a modal dialog.
+        """
+        with alerts.deferred(), self._write_lock:
+            yield
+
+    def snapshot(self):
+        """
+        Returns the latest published HubSnapshot.
+
+        This is a single attribute read: it never blocks and never copies,
+        and the returned view stays consistent however long it is held.
+        """
+        return self._snapshot
+
+    def publish(self, rooms=None):
+        """
+        Captures the current state as a new, versioned snapshot and swaps it in
+        atomically. Only the given rooms are copied again; the others are shared
+        with the previous snapshot. Must be called after any change that readers
+        should observe.
+
+        :param rooms: Rooms changed since the last publish, or None to refresh every room.
+        :return: The newly published HubSnapshot.
+        """
+        with self._write_lock:
+            prev = self._snapshot
+            dirty = None if rooms is None else set(rooms)
+            snap = build_snapshot(prev.version + 1, self.rooms, prev, dirty)
+            self._reindex(prev, snap)
+            self._snapshot = snap
+            for callback in self.subscribers:
+                self._notify(callback, snap)
+        return snap
+
+    def _notify(self, callback, snap):
+        """Delivers a snapshot to one subscriber; its failures never reach the writer."""
+        try:
+            callback(snap)
+        except Exception:
+            logger.exception("Snapshot subscriber %r failed on version %d", callback, snap.version)
+
+    def subscribe(self, callback):
+        """
+        Registers a function to be called with every newly published snapshot,
+        in publication order. It is called once immediately with the current one.
+        Exceptions raised by the callback are logged and otherwise ignored.
+
+        :param callback: A function accepting a HubSnapshot.
+        """
+        with self._write_lock:
+            self.subscribers.append(callback)
+            self._notify(callback, self._snapshot)
+
+    def device(self, dev_id):
+        """
+        Resolves a device id (e.g. from a DeviceSnapshot) to the live device.
+
+        :param dev_id: The device's UUID.
+        :return: The device, or None if it is no longer in any room.
+        """
+        entry = self._index.get(dev_id)
+        return entry[1] if entry else None
+
+    def room_snapshot(self, room, snap=None):
+        """
+        Returns the RoomSnapshot of a live room.
+
+        :param room: A Room registered with this hub.
+        :param snap: The HubSnapshot to look in; defaults to the latest one.
+        :return: The room's RoomSnapshot (empty if it is not published yet).
+        """
+        snap = snap or self._snapshot
+        i = self.rooms.index(room)
+        return snap.rooms[i] if i < len(snap.rooms) else RoomSnapshot(room.name, ())
+
+    def _reindex(self, prev, snap):
+        """Updates the device -> room index for the rooms rebuilt in `snap`."""
+        for i, room_snap in enumerate(snap.rooms):
+            old = prev.rooms[i] if i < len(prev.rooms) else None
+            if room_snap is old:
+                continue
+            room = self.rooms[i]
+            if old is not None:
+                for dev in old.devices:
+                    if self._index.get(dev.id, (None,))[0] is room:
+                        del self._index[dev.id]
+            for dev in room.devices:
+                self._index[dev.id] = (room, dev)
+
+    def _rooms_touched(self, cmds):
+        """
+        Returns the rooms containing the targets of the commands,
+        or None if any command does not declare its targets.
+        """
+        rooms = set()
+        for cmd in cmds:
+            targets = cmd.targets()
+            if targets is None:
+                return None
+            rooms.update(self._index[d.id][0] for d in targets if d.id in self._index)
+        return rooms
+
+    def mutate(self, change, rooms=None):
+        """
+        Applies an arbitrary state change as a writer and publishes the result.
+
+        :param change: A function performing the change; its return value is passed through.
+        :param rooms: Rooms touched by the change, or None if unknown.
+        :return: The change's result.
+        """
+        with self._writing():
+            try:
+                return change()
+            finally:
+                self.publish(rooms)
+
+    def execute(self, cmd):
+        """
+        Executes a command as a writer and publishes the resulting state.
+        Writers are serialized so each published version reflects whole commands.
+
+        :param cmd: A Command object.
+        :return: The command's result.
+        """
+        with self._writing():
+            rooms = self._rooms_touched((cmd,))
+            try:
+                return cmd.execute()
+            finally:
+                # Publish whatever was applied, even if the command failed midway
+                self.publish(rooms)
+
+    def execute_batch(self, cmds, capture_errors=False):
+        """
+        Executes several commands as one write and publishes a single snapshot,
+        so readers never observe the batch half-applied.
+
+        :param cmds: Iterable of Command objects.
+        :param capture_errors: If True, a failing command does not stop the batch;
+                               its exception is returned in place of its result.
+        :return: List of the commands' results, in order.
+        """
+        cmds = list(cmds)
+        with self._writing():
+            rooms = self._rooms_touched(cmds)
+            results = []
+            try:
+                for cmd in cmds:
+                    try:
+                        results.append(cmd.execute())
+                    except Exception as exc:
+                        if not capture_errors:
+                            raise
+                        results.append(exc)
+            finally:
+                # Publish whatever was applied, even if a command failed midway
+                self.publish(rooms)
+        return results
+
     def on_security_breach(self):
         """
         System-wide Event Handler.
@@ -36,11 +219,16 @@ class HomeHub:
         2. Trigger all SecurityAlarms.
         3. Alert the user via the UI.
         """
-        for room in self.rooms:
-            for dev in room.devices:
-                if isinstance(dev, SecurityLock):
-                    dev.block()
-                if isinstance(dev, SecurityAlarm):
-                    dev.trigger()
-
-        messagebox.showwarning("SECURITY BREACH", "All rooms have been BLOCKED!")
\ No newline at end of file
+        with self._writing():
+            try:
+                for room in self.rooms:
+                    for dev in room.devices:
+                        if has_capability(dev, LOCKABLE):
+                            dev.block()
+                        if has_capability(dev, ALARM):
+                            dev.trigger()
+            finally:
+                # Publish whatever was applied, even if a device failed midway
+                self.publish()
+            # Queued behind the siren alerts; all are shown after the lock is released
+            alerts.show("warning", "SECURITY BREACH", "All rooms have been BLOCKED!")
\ No newline at end of file
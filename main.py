@@ -1,14 +1,21 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
 from hub import HomeHub
-from devices import LightFixture, SmartThermostat
-from security_system import SecurityMotionSensor
-from commands import TogglePowerCommand, ChangeTempCommand
 from main_ui_classes import HomeHubUI
+from scheduler import Scheduler
+from status_table import StatusTable, default_name
 
 
 if __name__ == "__main__":
     hub = HomeHub()
+    # Published under a well-known name so monitors can attach with StatusTableReader()
+    status_table = StatusTable(default_name(), replace_stale=True)
+    hub.subscribe(status_table.on_snapshot)
+    print(f"Device status table published as: {status_table.name}")
     root = tk.Tk()
-    app = HomeHubUI(root, hub)
-    root.mainloop()
\ No newline at end of file
+    scheduler = Scheduler(hub)
+    app = HomeHubUI(root, hub, scheduler)
+    try:
+        root.mainloop()
+    finally:
+        status_table.close()
+        status_table.unlink()
\ No newline at end of file
@@ -1,14 +1,43 @@
 import tkinter as tk
 from tkinter import messagebox, ttk, simpledialog
-from commands import TogglePowerCommand, ChangeTempCommand
-from devices import LightFixture, SmartThermostat
-from security_system import SecurityMotionSensor, SecurityLock, SecurityDevice, SecurityAlarm
+from commands import (TogglePowerCommand, ChangeTempCommand, ArmCommand, DisarmCommand, UnblockCommand,
+                      TriggerDetectionCommand)
+from device_registry import registry, has_capability, SECURITY, LOCKABLE, SENSOR
+from scheduler import DailyAt, security_scene, temperature_scene
+
+
+# ==========================================
+# REMOTE PANEL RENDERERS (referenced by the device registry)
+# ==========================================
+
+def render_power_toggle(ui, frame, dev):
+    """Draws a single toggle button for a powerable device (given as a DeviceSnapshot)."""
+    tk.Button(frame, text=f"Toggle {dev.name}",
+              command=lambda: ui.execute_on(dev.id, TogglePowerCommand)).pack(side=tk.LEFT)
+
+
+def render_thermostat(ui, frame, dev):
+    """Draws power, temperature spinbox and set controls for a thermostat (given as a DeviceSnapshot)."""
+    pwr_color = "#90ee90" if dev.is_on else "#ff9999"
+    tk.Button(frame, text="Power", bg=pwr_color, width=6,
+              command=lambda: ui.execute_on(dev.id, TogglePowerCommand)).pack(side=tk.LEFT, padx=2)
+
+    tk.Label(frame, text=f"{dev.name}:").pack(side=tk.LEFT, padx=2)
+
+    spin = tk.Spinbox(frame, from_=15, to=30, width=5)
+    spin.delete(0, "end")
+    spin.insert(0, int(dev.temp))
+    spin.pack(side=tk.LEFT)
+
+    tk.Button(frame, text="Set",
+              command=lambda: ui.execute_on(dev.id, ChangeTempCommand, int(spin.get()))).pack(
+        side=tk.LEFT, padx=2)
 
 
 class RemoteControlUI:
     """
-    A Toplevel window acting as a central remote for specific controllable devices
-    (Lights and Thermostats). Uses the Command Pattern to execute actions.
+    A Toplevel window acting as a central remote for controllable devices
+    (any device type with a renderer). Uses the Command Pattern to execute actions.
     """
 
     def __init__(self, parent, hub):
@@ -28,13 +57,13 @@ class RemoteControlUI:
 
     def refresh(self):
         """
-        Clears and rebuilds the UI to reflect the current state of devices.
-        Iterates through all rooms and generates controls for LightFixtures and SmartThermostats.
+        Clears and rebuilds the UI from one consistent snapshot of the hub.
+        Iterates through all rooms and lets each device type's renderer draw its controls.
         """
         for widget in self.window.winfo_children():
             if isinstance(widget, tk.Frame): widget.destroy()
 
-        for room in self.hub.rooms:
+        for room in self.hub.snapshot().rooms:
             if not room.devices: continue
             group = tk.LabelFrame(self.window, text=room.name, padx=10, pady=5)
             group.pack(fill="x", padx=10, pady=5)
@@ -43,25 +72,22 @@ class RemoteControlUI:
                 frame = tk.Frame(group, pady=5)
                 frame.pack(fill="x")
 
-                if isinstance(dev, LightFixture):
-                    tk.Button(frame, text=f"Toggle {dev.name}",
-                              command=lambda d=dev: self.execute_cmd(TogglePowerCommand(d))).pack(side=tk.LEFT)
+                if dev.device_type and dev.device_type.renderer:
+                    dev.device_type.renderer(self, frame, dev)
 
-                elif isinstance(dev, SmartThermostat):
-                    pwr_color = "#90ee90" if dev.status == "ON" else "#ff9999"
-                    tk.Button(frame, text="Power", bg=pwr_color, width=6,
-                              command=lambda d=dev: self.execute_cmd(TogglePowerCommand(d))).pack(side=tk.LEFT, padx=2)
-
-                    tk.Label(frame, text=f"{dev.name}:").pack(side=tk.LEFT, padx=2)
-
-                    spin = tk.Spinbox(frame, from_=15, to=30, width=5)
-                    spin.delete(0, "end")
-                    spin.insert(0, int(dev.temp))
-                    spin.pack(side=tk.LEFT)
+    def execute_on(self, dev_id, command_cls, *args):
+        """
+        Builds a command for the live device behind a snapshot entry and executes it.
 
-                    tk.Button(frame, text="Set",
-                              command=lambda d=dev, s=spin: self.execute_cmd(ChangeTempCommand(d, int(s.get())))).pack(
-                        side=tk.LEFT, padx=2)
+        :param dev_id: The id of the device, as shown in the snapshot.
+        :param command_cls: The Command class, called as command_cls(device, *args).
+        """
+        dev = self.hub.device(dev_id)
+        if dev is None:
+            # Removed since this view was drawn
+            self.refresh()
+            return
+        self.execute_cmd(command_cls(dev, *args))
 
     def execute_cmd(self, cmd):
         """
@@ -69,7 +95,7 @@ class RemoteControlUI:
 
         :param cmd: A command object implementing the execute() method.
         """
-        res = cmd.execute()
+        res = self.hub.execute(cmd)
         print(f"Command Result: {res}")
         self.refresh()
 
@@ -80,16 +106,18 @@ class RoomInspectorUI:
     and simulating motion events.
     """
 
-    def __init__(self, parent, room, main_refresh_callback):
+    def __init__(self, parent, hub, room, main_refresh_callback):
         """
         Initialize the room inspector.
 
         :param parent: The parent Tkinter widget.
+        :param hub: The central HomeHub instance, through which changes are applied.
         :param room: The specific Room object to manage.
         :param main_refresh_callback: Callback to update the main HomeHubUI list.
         """
         self.window = tk.Toplevel(parent)
         self.window.title(f"Managing: {room.name}")
+        self.hub = hub
         self.room = room
         self.main_refresh = main_refresh_callback
 
@@ -98,7 +126,7 @@ class RoomInspectorUI:
 
         self.type_var = tk.StringVar(value="Light")
         ttk.Combobox(add_frame, textvariable=self.type_var,
-                     values=["Light", "Thermostat", "Lock", "Motion Sensor", "Alarm"]).pack(side=tk.LEFT)
+                     values=registry.names()).pack(side=tk.LEFT)
 
         self.name_entry = tk.Entry(add_frame)
         self.name_entry.insert(0, "Device Name")
@@ -114,10 +142,11 @@ class RoomInspectorUI:
         self.refresh()
 
     def refresh(self):
-        """Populates the listbox with the current devices in the room."""
+        """Populates the listbox with the room's devices, from the latest snapshot."""
+        self.shown = self.hub.room_snapshot(self.room).devices
         self.listbox.delete(0, tk.END)
-        for dev in self.room.devices:
-            self.listbox.insert(tk.END, f"{dev.name} [{dev.__class__.__name__}] - Status: {dev.status}")
+        for dev in self.shown:
+            self.listbox.insert(tk.END, f"{dev.name} [{dev.kind}] - Status: {dev.status}")
         self.main_refresh()
 
     def add_dev(self):
@@ -130,7 +159,10 @@ class RoomInspectorUI:
         """Removes the selected device from the room."""
         idx = self.listbox.curselection()
         if idx:
-            self.room.devices.pop(idx[0])
+            # Resolve the entry the user actually saw, not whatever is at that index now
+            dev = self.hub.device(self.shown[idx[0]].id)
+            if dev is not None:
+                self.room.remove_device(dev)
             self.refresh()
 
     def sim_motion(self):
@@ -138,14 +170,12 @@ class RoomInspectorUI:
         Triggers the detection logic on all Motion Sensors in the room.
         Warns if no sensors are present.
         """
-        sensors_found = False
-        for dev in self.room.devices:
-            if isinstance(dev, SecurityMotionSensor):
-                sensors_found = True
-                msg = dev.trigger_detection()
-                print(f"Sensor Debug: {msg}")
-
-        if not sensors_found:
+        sensors = [self.hub.device(d.id) for d in self.shown if d.has_capability(SENSOR)]
+        sensors = [dev for dev in sensors if dev is not None]
+        for msg in self.hub.execute_batch([TriggerDetectionCommand(dev) for dev in sensors]):
+            print(f"Sensor Debug: {msg}")
+
+        if not sensors:
             messagebox.showwarning("Warning", "No Motion Sensor in this room!")
         self.refresh()
 
@@ -156,15 +186,19 @@ class HomeHubUI:
     to specific subsystems (Remote, Security Panel).
     """
 
-    def __init__(self, root, hub):
+    SCHEDULER_POLL_MS = 1000
+
+    def __init__(self, root, hub, scheduler=None):
         """
         Initialize the main dashboard.
 
         :param root: The root Tkinter window.
         :param hub: The central HomeHub instance.
+        :param scheduler: Optional Scheduler whose due jobs are run from the Tk event loop.
         """
         self.hub = hub
         self.root = root
+        self.scheduler = scheduler
         self.root.title("Smart Home System")
         self.sample_counter = 1
 
@@ -179,12 +213,27 @@ class HomeHubUI:
                                                                                                     padx=5)
         tk.Button(top_frame, text="+ Sample Room", width=15, command=self.add_sample_room, bg="#e1bee7").pack(
             side=tk.LEFT, padx=5)
+        if self.scheduler:
+            tk.Button(top_frame, text="Schedules", width=12, command=self.open_schedules, bg="#fff3b0").pack(
+                side=tk.LEFT, padx=5)
 
         tk.Label(root, text="Double-click a room to manage devices:", font=("Arial", 9, "italic")).pack(pady=(10, 0))
         self.room_listbox = tk.Listbox(root, width=50, height=10)
         self.room_listbox.pack(padx=20, pady=10, fill="both", expand=True)
         self.room_listbox.bind('<Double-1>', self.open_room)
         self.refresh()
+        if self.scheduler:
+            self.root.after(self.SCHEDULER_POLL_MS, self.poll_scheduler)
+
+    def poll_scheduler(self):
+        """Runs any scheduled jobs that are due and re-arms the poll timer."""
+        try:
+            for due, job, results in self.scheduler.run_pending():
+                print(f"Scheduled [{job.name} @ {due:%Y-%m-%d %H:%M}]: {results}")
+            self.refresh()
+        finally:
+            # Keep polling even if this round failed
+            self.root.after(self.SCHEDULER_POLL_MS, self.poll_scheduler)
 
     def add_sample_room(self):
         """Generates a room populated with a full suite of test devices."""
@@ -199,12 +248,13 @@ class HomeHubUI:
         self.refresh()
 
     def refresh(self):
-        """Updates the room listbox."""
+        """Updates the room listbox from the latest published snapshot."""
+        snap = self.hub.snapshot()
         self.room_listbox.delete(0, tk.END)
-        if not self.hub.rooms:
+        if not snap.rooms:
             self.room_listbox.insert(tk.END, "No rooms added yet.")
         else:
-            for r in self.hub.rooms:
+            for r in snap.rooms:
                 self.room_listbox.insert(tk.END, f"{r.name} — ({len(r.devices)} devices)")
 
     def add_room(self):
@@ -218,13 +268,17 @@ class HomeHubUI:
         """Opens the RoomInspectorUI for the double-clicked room."""
         idx = self.room_listbox.curselection()
         if idx and self.hub.rooms:
-            RoomInspectorUI(self.root, self.hub.rooms[idx[0]], self.refresh)
+            RoomInspectorUI(self.root, self.hub, self.hub.rooms[idx[0]], self.refresh)
 
     def open_remote(self):
         """Opens the generic Remote Control UI."""
         if not self.hub.rooms: return
         RemoteControlUI(self.root, self.hub)
 
+    def open_schedules(self):
+        """Opens the Schedule Manager."""
+        ScheduleUI(self.root, self.hub, self.scheduler)
+
     def open_security(self):
         """Opens the dedicated Security Dashboard."""
         if not self.hub.rooms:
@@ -282,14 +336,14 @@ class SecurityDashboardUI:
 
     def refresh(self):
         """
-        Rebuilds the security device list inside the scrollable frame.
-        Filters devices to show only SecurityDevice or SecurityAlarm instances.
+        Rebuilds the security device list inside the scrollable frame from one
+        consistent snapshot. Filters devices to show only those with a security capability.
         """
         for widget in self.scroll_frame.winfo_children():
             widget.destroy()
 
-        for room in self.hub.rooms:
-            sec_devices = [d for d in room.devices if isinstance(d, (SecurityDevice, SecurityAlarm))]
+        for room in self.hub.snapshot().rooms:
+            sec_devices = [d for d in room.devices if d.has_capability(*SECURITY)]
             if not sec_devices: continue
 
             tk.Label(self.scroll_frame, text=f"ROOM: {room.name}",
@@ -299,22 +353,22 @@ class SecurityDashboardUI:
                 frame = tk.Frame(self.scroll_frame, bd=1, relief="groove", pady=5)
                 frame.pack(fill="x", padx=10, pady=2)
 
-                status_str = str(dev.status)
+                status_str = dev.status
                 color = "green" if status_str == "OFF" else "orange" if status_str == "ARMED" else "red"
 
-                tk.Label(frame, text=f"{dev.name} ({dev.__class__.__name__})",
+                tk.Label(frame, text=f"{dev.name} ({dev.kind})",
                          width=25, anchor="w").pack(side=tk.LEFT, padx=5)
 
                 tk.Label(frame, text=status_str, width=10, fg=color,
                          font=("Arial", 9, "bold")).pack(side=tk.LEFT)
 
-                tk.Button(frame, text="Arm", command=lambda d=dev: self.update_dev(d, "arm")).pack(side=tk.LEFT,
+                tk.Button(frame, text="Arm", command=lambda d=dev: self.update_dev(d.id, "arm")).pack(side=tk.LEFT,
                                                                                                    padx=2)
-                tk.Button(frame, text="Disarm", command=lambda d=dev: self.update_dev(d, "disarm")).pack(
+                tk.Button(frame, text="Disarm", command=lambda d=dev: self.update_dev(d.id, "disarm")).pack(
                     side=tk.LEFT, padx=2)
-                if isinstance(dev, SecurityLock):
+                if dev.has_capability(LOCKABLE):
                     tk.Button(frame, text="Unblock", bg="#ffffcc",
-                              command=lambda d=dev: self.update_dev(d, "unblock")).pack(side=tk.LEFT, padx=2)
+                              command=lambda d=dev: self.update_dev(d.id, "unblock")).pack(side=tk.LEFT, padx=2)
 
     def global_security_action(self, action):
         """
@@ -322,28 +376,125 @@ class SecurityDashboardUI:
 
         :param action: 'arm' to power on, 'disarm' to power off.
         """
-        for room in self.hub.rooms:
-            for dev in room.devices:
-                if isinstance(dev, SecurityDevice):
-                    if action == "arm":
-                        dev.powerOn()
-                    else:
-                        dev.powerOff()
+        command_cls = ArmCommand if action == "arm" else DisarmCommand
+        # One batch, so no snapshot ever shows the house half-armed
+        self.hub.execute_batch([command_cls(dev)
+                                for room in self.hub.rooms
+                                for dev in room.devices
+                                if has_capability(dev, *SECURITY)])
         self.refresh()
         self.main_refresh()
 
-    def update_dev(self, dev, action):
+    def update_dev(self, dev_id, action):
         """
         Performs an action on a single security device.
 
-        :param dev: The device object.
+        :param dev_id: The id of the device, as shown in the snapshot.
         :param action: 'arm', 'disarm', or 'unblock'.
         """
-        if action == "arm":
-            dev.powerOn()
-        elif action == "disarm":
-            dev.powerOff()
-        elif action == "unblock" and hasattr(dev, 'unblock'):
-            dev.unblock()
+        dev = self.hub.device(dev_id)
+        # Skipped if the device was removed since this view was drawn
+        if dev is not None:
+            if action == "arm":
+                self.hub.execute(ArmCommand(dev))
+            elif action == "disarm":
+                self.hub.execute(DisarmCommand(dev))
+            elif action == "unblock" and has_capability(dev, LOCKABLE):
+                self.hub.execute(UnblockCommand(dev))
         self.refresh()
-        self.main_refresh()
\ No newline at end of file
+        self.main_refresh()
+
+
+class ScheduleUI:
+    """
+    A Toplevel window for registering recurring scenes (arm/disarm, thermostat
+    setpoints) with the Scheduler and cancelling existing ones.
+    """
+    ALL_ROOMS = "All rooms"
+    ACTIONS = ["Arm", "Disarm", "Set temperature"]
+
+    def __init__(self, parent, hub, scheduler):
+        """
+        Initialize the schedule manager.
+
+        :param parent: The parent Tkinter widget.
+        :param hub: The central HomeHub instance.
+        :param scheduler: The Scheduler that runs the jobs.
+        """
+        self.window = tk.Toplevel(parent)
+        self.window.title("Schedules")
+        self.hub = hub
+        self.scheduler = scheduler
+
+        add_frame = tk.LabelFrame(self.window, text="New Daily Job", padx=5, pady=5)
+        add_frame.pack(fill="x", padx=10, pady=5)
+
+        self.action_var = tk.StringVar(value=self.ACTIONS[0])
+        ttk.Combobox(add_frame, textvariable=self.action_var, values=self.ACTIONS,
+                     state="readonly", width=14).pack(side=tk.LEFT)
+
+        self.room_var = tk.StringVar(value=self.ALL_ROOMS)
+        ttk.Combobox(add_frame, textvariable=self.room_var, state="readonly", width=14,
+                     values=[self.ALL_ROOMS] + [r.name for r in hub.rooms]).pack(side=tk.LEFT, padx=5)
+
+        tk.Label(add_frame, text="°C").pack(side=tk.LEFT)
+        self.temp_spin = tk.Spinbox(add_frame, from_=15, to=30, width=4)
+        self.temp_spin.delete(0, "end")
+        self.temp_spin.insert(0, 20)
+        self.temp_spin.pack(side=tk.LEFT, padx=2)
+
+        tk.Label(add_frame, text="at").pack(side=tk.LEFT)
+        self.time_entry = tk.Entry(add_frame, width=6)
+        self.time_entry.insert(0, "23:00")
+        self.time_entry.pack(side=tk.LEFT, padx=2)
+
+        self.weekdays_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(add_frame, text="Weekdays only", variable=self.weekdays_var).pack(side=tk.LEFT)
+
+        tk.Button(add_frame, text="+", command=self.add_job).pack(side=tk.LEFT, padx=5)
+
+        self.listbox = tk.Listbox(self.window, width=70)
+        self.listbox.pack(pady=10, padx=10)
+        tk.Button(self.window, text="Cancel Selected", command=self.cancel_job, bg="#ff9999").pack(pady=5)
+        self.refresh()
+
+    def refresh(self):
+        """Lists the active jobs with their next run time."""
+        self.jobs = self.scheduler.jobs()
+        self.listbox.delete(0, tk.END)
+        for job in self.jobs:
+            self.listbox.insert(tk.END, f"{job.name} — next: {job.next_run:%a %Y-%m-%d %H:%M}")
+
+    def add_job(self):
+        """Registers a daily job from the input fields."""
+        try:
+            hour, minute = (int(part) for part in self.time_entry.get().split(":"))
+            recurrence = DailyAt(hour, minute, DailyAt.WEEKDAYS if self.weekdays_var.get() else None)
+        except ValueError:
+            messagebox.showwarning("Schedules", "Enter the time as HH:MM.")
+            return
+
+        action = self.action_var.get()
+        room_name = None if self.room_var.get() == self.ALL_ROOMS else self.room_var.get()
+        if action == "Set temperature":
+            try:
+                temp = int(self.temp_spin.get())
+            except ValueError:
+                messagebox.showwarning("Schedules", "Enter the temperature as a whole number.")
+                return
+            commands = temperature_scene(self.hub, temp, room_name)
+            action = f"Set {temp}°C"
+        else:
+            commands = security_scene(self.hub, action == "Arm", room_name)
+
+        days = "weekdays" if self.weekdays_var.get() else "daily"
+        name = f"{action} — {self.room_var.get()} — {days} {hour:02d}:{minute:02d}"
+        self.scheduler.add_job(name, recurrence, commands)
+        self.refresh()
+
+    def cancel_job(self):
+        """Cancels the selected job."""
+        idx = self.listbox.curselection()
+        if idx:
+            self.scheduler.cancel(self.jobs[idx[0]])
+            self.refresh()
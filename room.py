@@ -1,5 +1,4 @@
-from devices import LightFixture, SmartThermostat
-from security_system import SecurityLock, SecurityMotionSensor, SecurityDevice, SecurityAlarm
+from device_registry import registry, has_capability, LOCKABLE, ALARM
 
 
 class Room:
@@ -8,44 +7,59 @@ class Room:
     It acts as a container for devices and a mediator for security events.
     """
 
-    def __init__(self, name, breach_callback):
+    def __init__(self, name, breach_callback, mutate=None):
         """
         Initialize the Room.
 
         :param name: The name of the room (e.g., "Living Room").
         :param breach_callback: A function to call when a security breach is confirmed
                                 (usually triggers the main system alarm).
+        :param mutate: Optional function that applies a change to the device list
+                       (usually HomeHub.mutate, which serializes it with other
+                       writers and publishes a new snapshot).
         """
         self.name = name
-        self.devices = []
+        # Immutable tuple, replaced on every change (copy-on-write)
+        self.devices = ()
         self.breach_callback = breach_callback
+        self.mutate = mutate
 
     def add_device(self, type_str, name):
         """
         Factory method to create and register a new device in the room.
 
-        :param type_str: The type of device to create ("Light", "Thermostat", "Lock", "Motion Sensor", "Alarm").
+        :param type_str: A type name registered in the device registry
+                         (e.g., "Light", "Thermostat", "Lock", "Motion Sensor", "Alarm").
         :param name: The friendly name for the new device.
         :return: The instantiated device object.
         """
-        # Mapping string identifiers to class constructors or lambdas
-        mapping = {
-            "Light": LightFixture,
-            "Thermostat": SmartThermostat,
-            "Lock": SecurityLock,
-            # Motion sensors require the breach callback injection
-            "Motion Sensor": lambda n: SecurityMotionSensor(n, self.breach_callback),
-            "Alarm": SecurityAlarm,
-        }
+        # Types that need it (e.g. motion sensors) receive the breach callback injection
+        dev = registry.create(type_str, name, self.breach_callback)
 
-        if type_str not in mapping:
-            raise ValueError(f"Unknown device type: {type_str}")
+        def change():
+            self.devices = self.devices + (dev,)
 
-        # Instantiate the device using the mapping
-        dev = mapping[type_str](name)
-        self.devices.append(dev)
+        self._apply(change)
         return dev
 
+    def remove_device(self, dev):
+        """
+        Removes a device from the room.
+
+        :param dev: The device object to remove.
+        """
+        def change():
+            self.devices = tuple(d for d in self.devices if d is not dev)
+
+        self._apply(change)
+
+    def _apply(self, change):
+        """Runs a device list change through the owner's mutate hook, if any."""
+        if self.mutate:
+            self.mutate(change, rooms=(self,))
+        else:
+            change()
+
     def breach_callback(self):
         """
         Orchestrates the room's response to a security breach.
@@ -55,13 +69,10 @@ class Room:
         (e.g., locking doors, sounding sirens).
         """
         for dev in self.devices:
-            # Filter for security-related devices
-            if isinstance(dev, (SecurityDevice, SecurityAlarm)):
-
-                # Trigger alarms/sirens if they are armed
-                if hasattr(dev, 'trigger') and not isinstance(dev, SecurityMotionSensor):
-                    dev.trigger(room_name=self.name)
+            # Trigger alarms/sirens if they are armed
+            if has_capability(dev, ALARM):
+                dev.trigger(room_name=self.name)
 
-                # Immediately block any locks in the room
-                if isinstance(dev, SecurityLock):
-                    dev.block()
\ No newline at end of file
+            # Immediately block any locks in the room
+            if has_capability(dev, LOCKABLE):
+                dev.block()
\ No newline at end of file
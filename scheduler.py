@@ -0,0 +1,320 @@
+import heapq
+import itertools
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from commands import Command, ArmCommand, DisarmCommand, ChangeTempCommand
+from device_registry import has_capability, SECURITY, TEMPERATURE
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# CLOCKS
+# ==========================================
+
+class SystemClock:
+    """Wall-clock time source used in production."""
+    def now(self):
+        return datetime.now()
+
+
+class VirtualClock:
+    """
+    Manually driven time source. Lets tests simulate days of schedules
+    instantly by moving time forward instead of waiting for it.
+    """
+    def __init__(self, start):
+        """
+        :param start: The datetime the clock starts at.
+        """
+        self._now = start
+
+    def now(self):
+        return self._now
+
+    def set(self, when):
+        """Moves the clock to an absolute time (never backwards)."""
+        if when < self._now:
+            raise ValueError("VirtualClock cannot move backwards.")
+        self._now = when
+
+    def advance(self, delta):
+        """Moves the clock forward by a timedelta."""
+        self.set(self._now + delta)
+
+
+# ==========================================
+# RECURRENCE RULES
+# ==========================================
+
+class Recurrence(ABC):
+    """
+    Describes when a job repeats. Implementations only have to answer
+    "what is the first occurrence strictly after this moment?".
+    """
+    @abstractmethod
+    def next_after(self, when):
+        """
+        :param when: A datetime.
+        :return: The first occurrence strictly later than `when`.
+        """
+        pass
+
+
+class Every(Recurrence):
+    """Repeats at a fixed interval, anchored to a start time."""
+    def __init__(self, interval, anchor):
+        """
+        :param interval: A positive timedelta between runs.
+        :param anchor: A datetime on which the sequence of runs is aligned.
+        """
+        if interval <= timedelta(0):
+            raise ValueError("Interval must be positive.")
+        self.interval = interval
+        self.anchor = anchor
+
+    def next_after(self, when):
+        if when < self.anchor:
+            return self.anchor
+        steps = (when - self.anchor) // self.interval + 1
+        return self.anchor + steps * self.interval
+
+
+class DailyAt(Recurrence):
+    """
+    Repeats every day at a fixed time of day, optionally only on some weekdays
+    (0 = Monday ... 6 = Sunday, as in datetime.weekday()).
+    """
+    WEEKDAYS = (0, 1, 2, 3, 4)
+
+    def __init__(self, hour, minute=0, weekdays=None):
+        """
+        :param hour: Hour of day (0-23).
+        :param minute: Minute of the hour (0-59).
+        :param weekdays: Optional iterable of weekday numbers; every day if None.
+        """
+        if not (0 <= hour <= 23 and 0 <= minute <= 59):
+            raise ValueError(f"Invalid time of day: {hour}:{minute:02d}")
+        self.hour = hour
+        self.minute = minute
+        self.weekdays = frozenset(weekdays) if weekdays is not None else None
+        if self.weekdays is not None and not self.weekdays:
+            raise ValueError("At least one weekday is required.")
+
+    def next_after(self, when):
+        candidate = when.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if candidate <= when:
+            candidate += timedelta(days=1)
+        while self.weekdays is not None and candidate.weekday() not in self.weekdays:
+            candidate += timedelta(days=1)
+        return candidate
+
+
+# ==========================================
+# SCENES (COMMAND SOURCES FOR JOBS)
+# ==========================================
+
+def _devices(hub, room_name, *capabilities):
+    """Devices with any of the capabilities, in one room or (room_name=None) everywhere."""
+    return [dev for room in hub.rooms if room_name is None or room.name == room_name
+            for dev in room.devices if has_capability(dev, *capabilities)]
+
+
+def security_scene(hub, arm, room_name=None):
+    """
+    Command source arming (or disarming) every security device, resolved at each run.
+
+    :param hub: The HomeHub whose devices are targeted.
+    :param arm: True to arm, False to disarm.
+    :param room_name: Limit the scene to one room; None for the whole house.
+    """
+    command_cls = ArmCommand if arm else DisarmCommand
+    return lambda: [command_cls(dev) for dev in _devices(hub, room_name, *SECURITY)]
+
+
+def temperature_scene(hub, temp, room_name=None):
+    """
+    Command source setting every thermostat to a temperature, resolved at each run.
+
+    :param hub: The HomeHub whose devices are targeted.
+    :param temp: The target temperature.
+    :param room_name: Limit the scene to one room; None for the whole house.
+    """
+    return lambda: [ChangeTempCommand(dev, temp) for dev in _devices(hub, room_name, TEMPERATURE)]
+
+
+# ==========================================
+# JOBS AND SCHEDULER
+# ==========================================
+
+class ScheduledJob:
+    """
+    A recurring job. Its commands are either a fixed Command or a callable
+    returning Commands, resolved at every run so that e.g.
+    "every thermostat in Wing B" also covers thermostats added later.
+    """
+    def __init__(self, name, recurrence, commands, catch_up, next_run):
+        self.name = name
+        self.recurrence = recurrence
+        self.commands = commands
+        self.catch_up = catch_up
+        self.next_run = next_run
+        self.cancelled = False
+
+    def resolve_commands(self):
+        """Returns the list of Command objects to execute for this run."""
+        if isinstance(self.commands, Command):
+            return [self.commands]
+        return list(self.commands())
+
+
+class Scheduler:
+    """
+    Runs existing Command objects on recurring schedules.
+
+    Jobs live in a min-heap keyed by (next run time, insertion order), so adding,
+    cancelling and finding the next due job stay cheap for very large numbers of
+    jobs. All jobs due at the same instant are executed as one hub batch.
+    After downtime, missed runs are replayed in the same (time, insertion) order
+    every time, or coalesced into a single run for jobs created with catch_up=False.
+    """
+    def __init__(self, hub, clock=None):
+        """
+        :param hub: The HomeHub that executes (and publishes) the commands.
+        :param clock: Time source; defaults to SystemClock. Pass a VirtualClock in tests.
+        """
+        self.hub = hub
+        self.clock = clock or SystemClock()
+        self._heap = []
+        self._seq = itertools.count()
+
+    def add_job(self, name, recurrence, commands, catch_up=True, start=None):
+        """
+        Registers a recurring job.
+
+        :param name: Human readable job name.
+        :param recurrence: A Recurrence describing when the job runs.
+        :param commands: A Command, or a callable returning an iterable of Commands.
+        :param catch_up: True to replay every missed run after downtime,
+                         False to run only once for all missed runs.
+        :param start: Only schedule runs after this datetime (defaults to now).
+        :return: The ScheduledJob, usable with cancel().
+        """
+        first = recurrence.next_after(start or self.clock.now())
+        job = ScheduledJob(name, recurrence, commands, catch_up, first)
+        self._push(job)
+        return job
+
+    def cancel(self, job):
+        """Stops a job from running again. The heap entry is dropped lazily."""
+        job.cancelled = True
+
+    def jobs(self):
+        """Returns the active jobs, soonest first."""
+        return [job for _, _, job in sorted(self._heap) if not job.cancelled]
+
+    def next_run_time(self):
+        """Returns the datetime of the earliest pending run, or None."""
+        self._drop_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    def run_pending(self):
+        """
+        Executes every run that is due at the current clock time, oldest first.
+        A failing job is logged and reported, but never stops the other jobs
+        or loses their runs.
+
+        :return: List of (due_time, job, results) tuples in execution order.
+                 `results` holds each command's result, or the exception it raised;
+                 if the job's commands could not be resolved, it is that exception.
+        """
+        now = self.clock.now()
+        executed = []
+        while True:
+            due = self.next_run_time()
+            if due is None or due > now:
+                break
+
+            batch = []
+            while self._heap and self._heap[0][0] == due:
+                _, _, job = heapq.heappop(self._heap)
+                if job.cancelled:
+                    continue
+                if not job.catch_up:
+                    latest = self._latest_missed(job, now)
+                    if latest != due:
+                        # Coalesce: fold all missed runs into the most recent one
+                        job.next_run = latest
+                        self._push(job)
+                        continue
+                batch.append(job)
+
+            for job in batch:
+                job.next_run = job.recurrence.next_after(due)
+                self._push(job)
+
+            if batch:
+                executed.extend(self._run_batch(due, batch))
+        return executed
+
+    def _run_batch(self, due, batch):
+        """Executes the jobs due at one tick as a single hub write."""
+        cmds_per_job = []
+        for job in batch:
+            try:
+                cmds_per_job.append(job.resolve_commands())
+            except Exception as exc:
+                logger.exception("Scheduled job %r could not resolve its commands at %s", job.name, due)
+                cmds_per_job.append(exc)
+
+        cmds = [c for cmds in cmds_per_job if not isinstance(cmds, Exception) for c in cmds]
+        results = self.hub.execute_batch(cmds, capture_errors=True)
+
+        outcomes = []
+        pos = 0
+        for job, cmds in zip(batch, cmds_per_job):
+            if isinstance(cmds, Exception):
+                outcomes.append((due, job, cmds))
+                continue
+            job_results = results[pos:pos + len(cmds)]
+            pos += len(cmds)
+            for res in job_results:
+                if isinstance(res, Exception):
+                    logger.error("Scheduled job %r failed at %s", job.name, due, exc_info=res)
+            outcomes.append((due, job, job_results))
+        return outcomes
+
+    def run_until(self, when):
+        """
+        Steps a VirtualClock through every due time up to `when`, running each
+        batch with the clock set to its own tick. Intended for simulations and tests.
+
+        :param when: The datetime to stop at.
+        :return: List of (due_time, job, results) tuples in execution order.
+        """
+        executed = []
+        while True:
+            due = self.next_run_time()
+            if due is None or due > when:
+                break
+            if due > self.clock.now():
+                self.clock.set(due)
+            executed.extend(self.run_pending())
+        self.clock.set(max(when, self.clock.now()))
+        return executed
+
+    def _latest_missed(self, job, now):
+        """Returns the last occurrence of the job that is not later than `now`."""
+        latest = job.next_run
+        following = job.recurrence.next_after(latest)
+        while following <= now:
+            latest = following
+            following = job.recurrence.next_after(latest)
+        return latest
+
+    def _push(self, job):
+        heapq.heappush(self._heap, (job.next_run, next(self._seq), job))
+
+    def _drop_cancelled(self):
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
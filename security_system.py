@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from tkinter import messagebox
+import alerts
 from base_device import SmartDevice
 
 # ==========================================
@@ -56,7 +56,7 @@ class ArmedState(SecurityState):
 
         if isinstance(device, SecurityAlarm):
             full_msg = f"LOCATION: {room_name}\nALARM: {device.name} is sounding!"
-            messagebox.showerror("SECURITY BREACH", full_msg)
+            alerts.show("error", "SECURITY BREACH", full_msg)
 
     def unblock(self, device): return "Not blocked."
 
@@ -69,7 +69,7 @@ class DetectedState(SecurityState):
         device.state = OffState()
         return f"Alert cleared. {device.name} is now OFF."
 
-    def trigger(self, name): return "Already triggered."
+    def trigger(self, device, room_name): return "Already triggered."
     def unblock(self, device): return "Not blocked."
 
 
@@ -129,5 +129,5 @@ class SecurityAlarm(SecurityDevice):
     def trigger(self, room_name="Unknown"):
         result = self.state.trigger(self, room_name)
         if isinstance(self.state, DetectedState):
-            messagebox.showerror("ALARM", f"Siren sounding in {room_name}!")
+            alerts.show("error", "ALARM", f"Siren sounding in {room_name}!")
         return result
\ No newline at end of file
@@ -0,0 +1,93 @@
+from collections import namedtuple
+from device_registry import type_of
+
+# ==========================================
+# IMMUTABLE VIEWS OF HUB STATE
+# ==========================================
+
+class DeviceSnapshot(namedtuple("DeviceSnapshot",
+                                ["id", "name", "kind", "device_type", "status", "is_on", "temp"])):
+    """
+    Frozen copy of a single device's state at the moment the snapshot was taken.
+    `device_type` is the registry DeviceType (None for unregistered devices) and
+    `temp` is None for devices without temperature control.
+    """
+    __slots__ = ()
+
+    def has_capability(self, *capabilities):
+        """Checks whether the device has at least one of the given capabilities."""
+        return self.device_type is not None and not self.device_type.capabilities.isdisjoint(capabilities)
+
+
+RoomSnapshot = namedtuple("RoomSnapshot", ["name", "devices"])
+RoomSnapshot.__doc__ = """Frozen copy of a room: its name and a tuple of DeviceSnapshots."""
+
+
+class HubSnapshot(namedtuple("HubSnapshot", ["version", "rooms"])):
+    """
+    A consistent, read-only view of every room and device in the hub.
+    Readers obtain one from HomeHub.snapshot() and may iterate it freely,
+    from any thread, while writers keep publishing newer versions.
+    """
+    __slots__ = ()
+
+    def iter_devices(self):
+        """
+        Yields (room_name, DeviceSnapshot) pairs across the whole house.
+        """
+        for room in self.rooms:
+            for dev in room.devices:
+                yield room.name, dev
+
+
+def snapshot_device(dev):
+    """
+    Copies the observable state of a live device.
+
+    :param dev: A SmartDevice instance.
+    :return: A DeviceSnapshot.
+    """
+    return DeviceSnapshot(
+        id=dev.id,
+        name=dev.name,
+        kind=dev.__class__.__name__,
+        device_type=type_of(dev),
+        status=str(dev.status),
+        is_on=dev._is_on,
+        temp=getattr(dev, "temp", None),
+    )
+
+
+def snapshot_room(room):
+    """
+    Copies a live room and the state of all its devices.
+
+    :param room: A Room instance.
+    :return: A RoomSnapshot.
+    """
+    return RoomSnapshot(room.name, tuple(snapshot_device(d) for d in room.devices))
+
+
+def build_snapshot(version, rooms, previous=None, dirty=None):
+    """
+    Builds a new HubSnapshot from the live rooms. RoomSnapshots of rooms that
+    did not change are shared with the previous snapshot instead of being copied.
+
+    :param version: Monotonically increasing version number for this snapshot.
+    :param rooms: Sequence of Room instances. Rooms are only ever appended, so
+                  they line up by position with the rooms of `previous`.
+    :param previous: The last published HubSnapshot, if any.
+    :param dirty: Set of rooms to rebuild; None rebuilds every room.
+    :return: A HubSnapshot.
+    """
+    reusable = previous.rooms if previous is not None and dirty is not None else ()
+    return HubSnapshot(
+        version=version,
+        rooms=tuple(
+            reusable[i] if i < len(reusable) and room not in dirty else snapshot_room(room)
+            for i, room in enumerate(rooms)
+        ),
+    )
+
+
+EMPTY_SNAPSHOT = HubSnapshot(version=0, rooms=())
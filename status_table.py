@@ -0,0 +1,312 @@
+import logging
+import math
+import multiprocessing
+import os
+import struct
+import time
+import uuid
+from collections import namedtuple
+from multiprocessing import shared_memory, resource_tracker
+from device_registry import registry, SECURITY
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# TABLE LAYOUT
+# ==========================================
+# Header: magic, layout version, row size, capacity, high-water row count, generation.
+# Row:    sequence, device uuid, type code, power flag, security code, temperature.
+#
+# Each row is guarded by its own sequence counter (a seqlock): the writer makes it
+# odd before touching the row and even again afterwards, so a reader that sees an
+# odd value, or different values before and after copying the row, retries.
+# The header generation is bumped after every published change, letting readers
+# skip a scan entirely when nothing has changed.
+
+MAGIC = b"HHST"
+LAYOUT_VERSION = 1
+HEADER = struct.Struct("<4sHHIIQ")
+ROW = struct.Struct("<I16sBBBxf4x")
+ROW_PAYLOAD = struct.Struct("<16sBBBxf")
+SEQ = struct.Struct("<I")
+# High-water row count and generation, as laid out at the end of HEADER
+COUNTERS = struct.Struct("<IQ")
+COUNTERS_OFFSET = 12
+
+# Type codes come from the device registry; 0 marks an empty slot
+UNKNOWN_TYPE = 255
+
+# Code 0 means the device has no security state
+SECURITY_CODES = {"OFF": 1, "ARMED": 2, "DETECTED": 3, "BLOCKED": 4}
+
+# Name the hub publishes under, so monitors can find the table without asking it.
+# Overridable through the environment, e.g. to run several hubs side by side.
+DEFAULT_NAME = "homehub_status"
+NAME_ENV_VAR = "HOMEHUB_STATUS_TABLE"
+
+# Names of tables created by this process. Readers in it share the writer's
+# resource tracker registration and must leave it alone.
+_created_here = set()
+
+StatusRow = namedtuple("StatusRow", ["slot", "id", "type_code", "is_on", "security_code", "temp"])
+StatusRow.__doc__ = """
+One device as read from the table. Use StatusTableReader.type_name() to turn
+`type_code` back into a device type name.
+"""
+
+
+def default_name():
+    """Returns the well-known table name: $HOMEHUB_STATUS_TABLE, or DEFAULT_NAME."""
+    return os.environ.get(NAME_ENV_VAR) or DEFAULT_NAME
+
+
+def encode_device(dev):
+    """
+    Converts a DeviceSnapshot into the fixed-size row payload fields.
+
+    :param dev: A DeviceSnapshot.
+    :return: Tuple matching ROW_PAYLOAD.
+    """
+    security = SECURITY_CODES.get(dev.status, 0) if dev.has_capability(*SECURITY) else 0
+    type_code = dev.device_type.code if dev.device_type is not None else UNKNOWN_TYPE
+    temp = float(dev.temp) if dev.temp is not None else math.nan
+    return (dev.id.bytes, type_code, int(dev.is_on), security, temp)
+
+
+# ==========================================
+# WRITER (OWNED BY THE HUB PROCESS)
+# ==========================================
+
+class StatusTable:
+    """
+    Publishes live device status into a shared memory block with a fixed layout,
+    so any number of local processes can poll thousands of devices without
+    serialization or IPC round-trips.
+
+    Subscribe it to a HomeHub; only rooms whose RoomSnapshot changed since the
+    previous publish are diffed, and only changed rows are rewritten in place.
+    Devices that do not fit are left out and listed in `overflow` until a slot frees up.
+    """
+    def __init__(self, name=None, capacity=4096, replace_stale=False):
+        """
+        :param name: Optional shared memory block name (see default_name()); generated if None.
+        :param capacity: Maximum number of devices the table can hold.
+        :param replace_stale: If a block with this name already exists (e.g. left behind
+                              by a hub that crashed), destroy it instead of failing.
+        """
+        self.capacity = capacity
+        size = HEADER.size + capacity * ROW.size
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            if not replace_stale:
+                raise
+            logger.warning("Replacing existing status table %r.", name)
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self.shm.name
+        _created_here.add(self.name)
+        self._buf = self.shm.buf
+        self._slots = {}
+        self._rows = {}
+        self._room_snaps = ()
+        self.overflow = set()
+        self._free = []
+        self._high_water = 0
+        self._generation = 0
+        HEADER.pack_into(self._buf, 0, MAGIC, LAYOUT_VERSION, ROW.size, capacity, 0, 0)
+
+    def on_snapshot(self, snapshot):
+        """
+        Hub subscriber callback: applies the differences between the previously
+        written state and the new HubSnapshot.
+
+        :param snapshot: The newly published HubSnapshot.
+        """
+        # While devices are waiting for a slot, rescan every room so they get one
+        rescan = bool(self.overflow)
+        dirty = []
+        for i, room in enumerate(snapshot.rooms):
+            old = self._room_snaps[i] if i < len(self._room_snaps) else None
+            if room is not old or rescan:
+                dirty.append((old, room))
+
+        changed = False
+        # Free the slots of removed devices first, so new devices can reuse them
+        for old, room in dirty:
+            if old is not None:
+                current = {dev.id for dev in room.devices}
+                for dev in old.devices:
+                    if dev.id not in current:
+                        changed |= self._release(dev.id)
+
+        for _, room in dirty:
+            for dev in room.devices:
+                payload = encode_device(dev)
+                if self._rows.get(dev.id) == payload:
+                    continue
+                slot = self._slot_for(dev.id)
+                if slot is None:
+                    if dev.id not in self.overflow:
+                        logger.warning("Status table is full (%d devices); %s (%s) is not published.",
+                                       self.capacity, dev.name, dev.id)
+                        self.overflow.add(dev.id)
+                    continue
+                self.overflow.discard(dev.id)
+                self._write_row(slot, payload)
+                self._rows[dev.id] = payload
+                changed = True
+        self._room_snaps = snapshot.rooms
+
+        if changed:
+            self._generation += 1
+            COUNTERS.pack_into(self._buf, COUNTERS_OFFSET, self._high_water, self._generation)
+
+    def close(self):
+        """Detaches from the shared memory block."""
+        self._buf = None
+        self.shm.close()
+
+    def unlink(self):
+        """Destroys the shared memory block. Call once, after close()."""
+        self.shm.unlink()
+        _created_here.discard(self.name)
+
+    def _slot_for(self, dev_id):
+        """
+        Returns the slot of a device, allocating one (reusing freed slots first),
+        or None if the table is full.
+        """
+        if dev_id in self._slots:
+            return self._slots[dev_id]
+        if self._free:
+            slot = self._free.pop()
+        elif self._high_water < self.capacity:
+            slot = self._high_water
+            self._high_water += 1
+        else:
+            return None
+        self._slots[dev_id] = slot
+        return slot
+
+    def _release(self, dev_id):
+        """Clears the row of a removed device. Returns True if a row was written."""
+        self.overflow.discard(dev_id)
+        if dev_id not in self._slots:
+            return False
+        slot = self._slots.pop(dev_id)
+        del self._rows[dev_id]
+        self._write_row(slot, (bytes(16), 0, 0, 0, math.nan))
+        self._free.append(slot)
+        return True
+
+    def _write_row(self, slot, payload):
+        """Rewrites one row under its seqlock."""
+        offset = HEADER.size + slot * ROW.size
+        seq = SEQ.unpack_from(self._buf, offset)[0]
+        SEQ.pack_into(self._buf, offset, (seq + 1) & 0xFFFFFFFF)
+        ROW_PAYLOAD.pack_into(self._buf, offset + SEQ.size, *payload)
+        SEQ.pack_into(self._buf, offset, (seq + 2) & 0xFFFFFFFF)
+
+
+# ==========================================
+# READER (ANY LOCAL PROCESS)
+# ==========================================
+
+def _attach(name):
+    """
+    Opens an existing shared memory block without taking ownership of it,
+    so a reader exiting never destroys the hub's table.
+    """
+    try:
+        # Python 3.13+: keep the block out of the resource tracker entirely
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    shm = shared_memory.SharedMemory(name=name)
+    # Older Pythons register every attach on POSIX, and the tracker destroys registered
+    # blocks when it shuts down. An independent reader has its own tracker and must undo
+    # that. In the writer's process, or a multiprocessing child sharing its tracker, the
+    # registration is the writer's own, and removing it would leak the block on a crash.
+    shares_writer_tracker = name in _created_here or multiprocessing.parent_process() is not None
+    if os.name == "posix" and not shares_writer_tracker:
+        resource_tracker.unregister("/" + shm.name, "shared_memory")
+    return shm
+
+
+class StatusTableReader:
+    """
+    Read-only view of a StatusTable from another process.
+    Rows are copied out under their seqlock, so a returned row is never torn.
+    """
+    def __init__(self, name=None):
+        """
+        :param name: The `name` of the StatusTable to attach to; defaults to default_name().
+        """
+        name = name or default_name()
+        self.shm = _attach(name)
+        self._buf = self.shm.buf
+        magic, version, row_size, self.capacity, _, _ = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION or row_size != ROW.size:
+            raise ValueError(f"{name} is not a compatible status table.")
+
+    def generation(self):
+        """Returns the change counter; unchanged means no row has been rewritten."""
+        return COUNTERS.unpack_from(self._buf, COUNTERS_OFFSET)[1]
+
+    def read_row(self, slot, timeout=0.1):
+        """
+        Reads one row consistently.
+
+        :param slot: Row index.
+        :param timeout: Seconds to keep retrying while the row is being written.
+        :return: A StatusRow, or None if the slot is empty.
+        :raises TimeoutError: If the row stays mid-write, e.g. because the hub
+                              process died while updating it.
+        """
+        offset = HEADER.size + slot * ROW.size
+        deadline = time.monotonic() + timeout
+        while True:
+            before = SEQ.unpack_from(self._buf, offset)[0]
+            if not before & 1:
+                raw, type_code, is_on, security, temp = ROW_PAYLOAD.unpack_from(self._buf, offset + SEQ.size)
+                if SEQ.unpack_from(self._buf, offset)[0] == before:
+                    break
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Status table row {slot} is still being written after {timeout}s.")
+            # Let the writer finish instead of spinning at full speed
+            time.sleep(0)
+        if type_code == 0:
+            return None
+        return StatusRow(slot, uuid.UUID(bytes=raw), type_code, bool(is_on), security,
+                         None if math.isnan(temp) else temp)
+
+    @staticmethod
+    def type_name(type_code):
+        """
+        Maps a row's type code back to its registered device type name.
+
+        :param type_code: The `type_code` of a StatusRow.
+        :return: The type name, or None for unknown/unregistered types.
+        """
+        try:
+            return registry.get_by_code(type_code).name
+        except ValueError:
+            return None
+
+    def read_all(self, timeout=0.1):
+        """
+        Returns a StatusRow for every occupied slot.
+
+        :param timeout: Per-row retry limit, see read_row().
+        """
+        high_water = COUNTERS.unpack_from(self._buf, COUNTERS_OFFSET)[0]
+        rows = (self.read_row(slot, timeout) for slot in range(high_water))
+        return [row for row in rows if row is not None]
+
+    def close(self):
+        """Detaches from the shared memory block."""
+        self._buf = None
+        self.shm.close()
@@ -0,0 +1,77 @@
+import sys
+import pytest
+from device_registry import DeviceRegistry, registry, has_capability, type_of, SECURITY, POWERABLE, LOCKABLE
+from hub import HomeHub
+from security_system import SecurityLock
+
+PLUGIN_MODULE = "vendor_widgets_not_installed"
+
+
+@pytest.fixture
+def plugin_registry(monkeypatch):
+    """The global registry plus a type whose module does not exist, undone after the test."""
+    for attr in ("_types", "_by_code", "_by_target", "_class_cache"):
+        monkeypatch.setattr(registry, attr, dict(getattr(registry, attr)))
+    registry.register("Widget", 200, f"{PLUGIN_MODULE}:Widget", {POWERABLE},
+                      renderer=f"{PLUGIN_MODULE}:render_widget")
+    return registry
+
+
+def test_registering_a_type_does_not_import_it(plugin_registry):
+    hub = HomeHub()
+    room = hub.create_room("Hall")
+    light = room.add_device("Light", "Lamp")
+    lock = room.add_device("Lock", "Door")
+
+    # Everything the hub and the panels do with the catalogue
+    assert has_capability(light, POWERABLE)
+    assert has_capability(lock, *SECURITY)
+    assert [d.device_type.name for d in hub.snapshot().rooms[0].devices] == ["Light", "Lock"]
+    assert "Widget" in plugin_registry.names()
+    assert plugin_registry.get_by_code(200).name == "Widget"
+
+    assert PLUGIN_MODULE not in sys.modules
+
+
+def test_creating_a_type_imports_it_on_demand(plugin_registry):
+    with pytest.raises(ModuleNotFoundError):
+        plugin_registry.create("Widget", "W1")
+
+
+def test_subclasses_resolve_to_the_nearest_registered_type():
+    class KeypadLock(SecurityLock):
+        pass
+
+    class BiometricLock(KeypadLock):
+        pass
+
+    assert type_of(KeypadLock("Front")).name == "Lock"
+    assert has_capability(BiometricLock("Vault"), LOCKABLE)
+    assert registry.type_for_class(object) is None
+
+
+def test_register_rejects_bad_and_duplicate_codes():
+    catalogue = DeviceRegistry()
+    catalogue.register("Light", 1, "devices:LightFixture", {POWERABLE})
+
+    for code in (0, DeviceRegistry.MAX_CODE + 1):
+        with pytest.raises(ValueError):
+            catalogue.register("Other", code, "devices:Other", {POWERABLE})
+    with pytest.raises(ValueError, match="already used by Light"):
+        catalogue.register("Other", 1, "devices:Other", {POWERABLE})
+
+
+def test_register_rejects_duplicate_names_and_targets():
+    catalogue = DeviceRegistry()
+    catalogue.register("Light", 1, "devices:LightFixture", {POWERABLE})
+
+    with pytest.raises(ValueError):
+        catalogue.register("Light", 2, "devices:Other", {POWERABLE})
+    with pytest.raises(ValueError, match="already registered as Light"):
+        catalogue.register("Dimmer", 2, "devices:LightFixture", {POWERABLE})
+    assert catalogue.names() == ["Light"]
+
+
+def test_builtin_codes_are_stable():
+    assert {name: registry.get(name).code for name in registry.names()} == {
+        "Light": 1, "Thermostat": 2, "Lock": 3, "Motion Sensor": 4, "Alarm": 5}
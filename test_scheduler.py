@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta
+import pytest
+from commands import Command
+from hub import HomeHub
+from scheduler import Scheduler, VirtualClock, DailyAt, Every, temperature_scene
+
+# Monday
+START = datetime(2026, 10, 19, 8, 0)
+
+
+class RecordCommand(Command):
+    """Records the clock time of each execution under a label."""
+    def __init__(self, log, label, clock):
+        self.log = log
+        self.label = label
+        self.clock = clock
+
+    def execute(self):
+        self.log.append((self.label, self.clock.now()))
+        return self.label
+
+    def targets(self):
+        return ()
+
+
+class FailCommand(Command):
+    def execute(self):
+        raise RuntimeError("boom")
+
+    def targets(self):
+        return ()
+
+
+def make_scheduler():
+    hub = HomeHub()
+    clock = VirtualClock(START)
+    return hub, clock, Scheduler(hub, clock)
+
+
+def test_daily_at_skips_weekend():
+    rule = DailyAt(23, weekdays=DailyAt.WEEKDAYS)
+    friday_night = datetime(2026, 10, 23, 23, 0)
+    assert rule.next_after(datetime(2026, 10, 23, 22, 0)) == friday_night
+    assert rule.next_after(friday_night) == datetime(2026, 10, 26, 23, 0)
+
+
+def test_daily_at_rolls_over_to_next_day():
+    rule = DailyAt(7, 30)
+    assert rule.next_after(datetime(2026, 10, 19, 7, 30)) == datetime(2026, 10, 20, 7, 30)
+    assert rule.next_after(datetime(2026, 12, 31, 8, 0)) == datetime(2027, 1, 1, 7, 30)
+
+
+def test_same_tick_jobs_run_as_one_batch():
+    hub, clock, scheduler = make_scheduler()
+    log = []
+    scheduler.add_job("a", DailyAt(9), RecordCommand(log, "a", clock))
+    scheduler.add_job("b", DailyAt(9), RecordCommand(log, "b", clock))
+    version = hub.snapshot().version
+
+    clock.advance(timedelta(hours=1))
+    executed = scheduler.run_pending()
+
+    assert [(job.name, results) for _, job, results in executed] == [("a", ["a"]), ("b", ["b"])]
+    assert hub.snapshot().version == version + 1
+
+
+def test_catch_up_replays_missed_runs_in_order():
+    _, clock, scheduler = make_scheduler()
+    log = []
+    scheduler.add_job("night", DailyAt(23), RecordCommand(log, "night", clock))
+    scheduler.add_job("morning", DailyAt(7), RecordCommand(log, "morning", clock))
+
+    clock.advance(timedelta(days=2))
+    executed = scheduler.run_pending()
+
+    assert [(due, job.name) for due, job, _ in executed] == [
+        (datetime(2026, 10, 19, 23, 0), "night"),
+        (datetime(2026, 10, 20, 7, 0), "morning"),
+        (datetime(2026, 10, 20, 23, 0), "night"),
+        (datetime(2026, 10, 21, 7, 0), "morning"),
+    ]
+
+
+def test_catch_up_false_coalesces_missed_runs():
+    _, clock, scheduler = make_scheduler()
+    log = []
+    scheduler.add_job("hourly", Every(timedelta(hours=1), START), RecordCommand(log, "hourly", clock),
+                      catch_up=False)
+
+    clock.advance(timedelta(hours=5, minutes=30))
+    executed = scheduler.run_pending()
+
+    assert [due for due, _, _ in executed] == [START + timedelta(hours=5)]
+    assert scheduler.next_run_time() == START + timedelta(hours=6)
+
+
+def test_run_until_simulates_a_week_at_each_tick():
+    _, clock, scheduler = make_scheduler()
+    log = []
+    scheduler.add_job("workday", DailyAt(7, weekdays=DailyAt.WEEKDAYS), RecordCommand(log, "workday", clock))
+
+    scheduler.run_until(START + timedelta(days=7))
+
+    # Tuesday to Friday, then the following Monday; each ran with the clock at its own tick
+    assert [when for _, when in log] == [datetime(2026, 10, d, 7, 0) for d in (20, 21, 22, 23, 26)]
+    assert clock.now() == START + timedelta(days=7)
+
+
+def test_cancelled_job_does_not_run():
+    _, clock, scheduler = make_scheduler()
+    log = []
+    job = scheduler.add_job("a", DailyAt(9), RecordCommand(log, "a", clock))
+    scheduler.cancel(job)
+
+    scheduler.run_until(START + timedelta(days=3))
+
+    assert log == []
+    assert scheduler.jobs() == []
+
+
+def test_failing_job_does_not_stop_others():
+    _, clock, scheduler = make_scheduler()
+    log = []
+    scheduler.add_job("bad", DailyAt(9), FailCommand())
+    scheduler.add_job("good", DailyAt(9), RecordCommand(log, "good", clock))
+
+    scheduler.run_until(START + timedelta(days=2))
+
+    assert len(log) == 2
+    assert scheduler.next_run_time() == datetime(2026, 10, 21, 9, 0)
+
+
+def test_temperature_scene_covers_devices_added_later():
+    hub, clock, scheduler = make_scheduler()
+    wing_b = hub.create_room("Wing B")
+    scheduler.add_job("setback", DailyAt(9), temperature_scene(hub, 19, "Wing B"))
+    thermostat = wing_b.add_device("Thermostat", "T1")
+
+    scheduler.run_until(START + timedelta(hours=2))
+
+    assert thermostat.temp == 19
+    assert hub.snapshot().rooms[0].devices[0].temp == 19
+
+
+def test_daily_at_rejects_invalid_times():
+    for hour, minute in ((24, 0), (-1, 0), (7, 60), (7, -5)):
+        with pytest.raises(ValueError):
+            DailyAt(hour, minute)
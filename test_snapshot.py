@@ -0,0 +1,98 @@
+import threading
+import pytest
+import alerts
+from commands import TogglePowerCommand, ChangeTempCommand, ArmCommand, DisarmCommand, TriggerDetectionCommand
+from hub import HomeHub
+
+
+@pytest.fixture(autouse=True)
+def silent_alerts(monkeypatch):
+    """Breaches would otherwise open message boxes."""
+    shown = []
+    monkeypatch.setattr(alerts, "_display", lambda *alert: shown.append(alert))
+    return shown
+
+
+def make_hub():
+    hub = HomeHub()
+    living = hub.create_room("Living Room")
+    office = hub.create_room("Office")
+    return hub, living, office
+
+
+def test_held_snapshot_is_not_affected_by_later_writes():
+    hub, living, _ = make_hub()
+    light = living.add_device("Light", "Lamp")
+    before = hub.snapshot()
+
+    hub.execute(TogglePowerCommand(light))
+    living.add_device("Thermostat", "AC")
+
+    assert [(d.name, d.status) for d in before.rooms[0].devices] == [("Lamp", "OFF")]
+    assert [d.name for d in hub.snapshot().rooms[0].devices] == ["Lamp", "AC"]
+    assert hub.snapshot().rooms[0].devices[0].status == "ON"
+
+
+def test_each_write_bumps_the_version_once():
+    hub, living, _ = make_hub()
+    light = living.add_device("Light", "Lamp")
+    thermostat = living.add_device("Thermostat", "AC")
+    version = hub.snapshot().version
+
+    hub.execute(TogglePowerCommand(light))
+    assert hub.snapshot().version == version + 1
+
+    hub.execute_batch([TogglePowerCommand(light), ChangeTempCommand(thermostat, 18)])
+    assert hub.snapshot().version == version + 2
+
+
+def test_unchanged_rooms_are_shared_between_versions():
+    hub, living, office = make_hub()
+    light = living.add_device("Light", "Lamp")
+    office.add_device("Light", "Desk Lamp")
+    before = hub.snapshot()
+
+    hub.execute(TogglePowerCommand(light))
+    after = hub.snapshot()
+
+    assert after.rooms[1] is before.rooms[1]
+    assert after.rooms[0] is not before.rooms[0]
+
+
+def test_device_ids_resolve_to_live_devices_until_removed():
+    hub, living, _ = make_hub()
+    light = living.add_device("Light", "Lamp")
+    dev_id = hub.room_snapshot(living).devices[0].id
+
+    assert hub.device(dev_id) is light
+
+    living.remove_device(light)
+    assert hub.device(dev_id) is None
+    assert hub.room_snapshot(living).devices == ()
+
+
+def test_repeated_motion_detection_is_published():
+    hub, living, _ = make_hub()
+    sensor = living.add_device("Motion Sensor", "PIR")
+    alarm = living.add_device("Alarm", "Siren")
+    hub.execute_batch([ArmCommand(sensor), ArmCommand(alarm)])
+
+    hub.execute(TriggerDetectionCommand(sensor))
+    hub.execute(DisarmCommand(sensor))
+    hub.execute(ArmCommand(sensor))
+    hub.execute(TriggerDetectionCommand(sensor))
+
+    assert [d.status for d in hub.snapshot().rooms[0].devices] == ["DETECTED", "DETECTED"]
+
+
+def test_concurrent_writers_do_not_lose_devices():
+    hub, living, _ = make_hub()
+    threads = [threading.Thread(target=lambda i=i: [living.add_device("Light", f"L{i}-{k}") for k in range(100)])
+               for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(living.devices) == 400
+    assert len(hub.snapshot().rooms[0].devices) == 400
@@ -0,0 +1,119 @@
+import uuid
+import pytest
+from commands import TogglePowerCommand, ChangeTempCommand, ArmCommand
+from hub import HomeHub
+from status_table import (StatusTable, StatusTableReader, HEADER, ROW, SEQ, SECURITY_CODES,
+                          NAME_ENV_VAR, default_name)
+
+
+@pytest.fixture
+def open_table():
+    """Creates tables and readers on demand and releases them after the test."""
+    tables, readers = [], []
+
+    def make(capacity=8, name=None):
+        hub = HomeHub()
+        table = StatusTable(name, capacity=capacity)
+        tables.append(table)
+        hub.subscribe(table.on_snapshot)
+        reader = StatusTableReader(table.name)
+        readers.append(reader)
+        return hub, table, reader
+
+    yield make
+    for reader in readers:
+        reader.close()
+    for table in tables:
+        table.close()
+        table.unlink()
+
+
+def test_layout_is_fixed_size():
+    assert HEADER.size == 24
+    assert ROW.size == 32
+
+
+def test_rows_round_trip_device_state(open_table):
+    hub, _, reader = open_table()
+    room = hub.create_room("Hall")
+    thermostat = room.add_device("Thermostat", "AC")
+    lock = room.add_device("Lock", "Door")
+    hub.execute_batch([TogglePowerCommand(thermostat), ChangeTempCommand(thermostat, 22), ArmCommand(lock)])
+
+    rows = {row.id: row for row in reader.read_all()}
+
+    assert rows[thermostat.id].is_on is True
+    assert rows[thermostat.id].temp == 22.0
+    assert rows[thermostat.id].security_code == 0
+    assert reader.type_name(rows[thermostat.id].type_code) == "Thermostat"
+    assert rows[lock.id].security_code == SECURITY_CODES["ARMED"]
+    assert rows[lock.id].temp is None
+    assert reader.type_name(rows[lock.id].type_code) == "Lock"
+
+
+def test_removed_device_frees_its_slot_for_reuse(open_table):
+    hub, _, reader = open_table()
+    room = hub.create_room("Hall")
+    first = room.add_device("Light", "A")
+    room.add_device("Light", "B")
+    freed_slot = next(row.slot for row in reader.read_all() if row.id == first.id)
+
+    room.remove_device(first)
+    assert first.id not in {row.id for row in reader.read_all()}
+
+    third = room.add_device("Light", "C")
+    assert next(row.slot for row in reader.read_all() if row.id == third.id) == freed_slot
+
+
+def test_overflow_is_skipped_then_promoted_when_a_slot_frees(open_table):
+    hub, table, reader = open_table(capacity=2)
+    room = hub.create_room("Hall")
+    first = room.add_device("Light", "A")
+    second = room.add_device("Light", "B")
+    third = room.add_device("Light", "C")
+
+    assert len(room.devices) == 3
+    assert table.overflow == {third.id}
+    assert {row.id for row in reader.read_all()} == {first.id, second.id}
+
+    # The hub keeps accepting commands while the table is full
+    hub.execute(TogglePowerCommand(second))
+
+    room.remove_device(first)
+    assert table.overflow == set()
+    assert {row.id for row in reader.read_all()} == {second.id, third.id}
+
+
+def test_generation_only_changes_when_rows_change(open_table):
+    hub, _, reader = open_table()
+    room = hub.create_room("Hall")
+    light = room.add_device("Light", "A")
+    generation = reader.generation()
+
+    hub.publish()
+    assert reader.generation() == generation
+
+    hub.execute(TogglePowerCommand(light))
+    assert reader.generation() == generation + 1
+
+
+def test_row_stuck_mid_write_times_out(open_table):
+    hub, table, reader = open_table()
+    hub.create_room("Hall").add_device("Light", "A")
+
+    # An odd sequence number means the writer died while updating the row
+    SEQ.pack_into(table.shm.buf, HEADER.size, 1)
+
+    with pytest.raises(TimeoutError):
+        reader.read_row(0, timeout=0.01)
+
+
+def test_reader_defaults_to_the_well_known_name(open_table, monkeypatch):
+    monkeypatch.setenv(NAME_ENV_VAR, f"homehub_test_{uuid.uuid4().hex[:8]}")
+    _, table, _ = open_table(name=default_name())
+
+    reader = StatusTableReader()
+    try:
+        assert reader.capacity == table.capacity
+    finally:
+        reader.close()